@@ -4,10 +4,34 @@
 """Tokenize IPA transcriptions from CSV data."""
 
 from argparse import ArgumentParser, Namespace
+from contextlib import closing, ExitStack
 from csv import reader, writer
+from itertools import islice
+from multiprocessing.pool import Pool
+import os
+from pathlib import Path
+import sqlite3
 import sys
+import typing as t
 
-from ipa_tokenizer.tokenizer import tokenize, UnknownSymbol
+from ipa_tokenizer._cli import (
+    ignore_interrupts,
+    PARALLEL_BATCH_SIZE,
+    PARALLEL_THRESHOLD,
+    positive_int,
+)
+from ipa_tokenizer.tokenizer import (
+    _tokenize,
+    default_corrections,
+    UnknownSymbol,
+)
+
+
+Key: t.TypeAlias = tuple[str, str]     # (language, IPA transcription)
+Result: t.TypeAlias = str | UnknownSymbol
+
+BATCH_SIZE = 1024
+BUFFER_SIZE = 1 << 20
 
 
 def parse_args() -> Namespace:
@@ -19,15 +43,15 @@ def parse_args() -> Namespace:
         dest="silent",
         default=False,
         action="store_true",
-        help="continue silently on error",
+        help="continue silently on error (rows with unknown symbols or "
+        "missing columns are skipped)",
     )
     parser.add_argument(
         "-n",
         "--index",
         dest="index",
         type=int,
-        default=[0],
-        nargs=1,
+        default=0,
         help="column index of IPA transcriptions (default: 0)",
     )
     parser.add_argument(
@@ -35,48 +59,278 @@ def parse_args() -> Namespace:
         "--language",
         dest="language_index",
         type=int,
-        default=[None],
-        nargs=1,
+        default=None,
         help="column index of Wiktionary language code (default: None)",
     )
-    args = parser.parse_args()
-    args.index = args.index[0]
-    args.language_index = args.language_index[0]
-    return args
+    parser.add_argument(
+        "-b",
+        "--batch",
+        dest="batch_size",
+        type=positive_int,
+        default=PARALLEL_BATCH_SIZE,
+        help="number of rows to read at a time and tokenize in parallel "
+        f"(default: {PARALLEL_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        type=Path,
+        default=None,
+        help="SQLite database for caching tokenized transcriptions between "
+        "runs (delete after updating ipa-tokenizer) (default: None)",
+    )
+    return parser.parse_args()
 
 
-def main(args: Namespace) -> None:
-    """Script entrypoint."""
-    out = writer(sys.stdout)
+def open_cache(path: Path) -> sqlite3.Connection:
+    """Open SQLite database of tokenized transcriptions."""
+    database = sqlite3.connect(path)
+    database.execute("PRAGMA journal_mode=WAL")
+    database.execute(
+        "CREATE TABLE IF NOT EXISTS tokens "
+        "(language TEXT, ipa TEXT, tokens TEXT, PRIMARY KEY (language, ipa))"
+    )
+    return database
+
+
+def load_cache(database: sqlite3.Connection) -> dict[Key, Result]:
+    """Load tokenized transcriptions from SQLite database."""
+    query = "SELECT language, ipa, tokens FROM tokens"
+    return {
+        (language, ipa): tokens
+        for language, ipa, tokens in database.execute(query)
+    }
+
+
+def save_cache(
+    database: sqlite3.Connection,
+    keys: list[Key],
+    cache: dict[Key, Result],
+) -> None:
+    """Save tokenized transcriptions to SQLite database.
+
+    Transcriptions that failed to tokenize aren't saved.
+    """
+    rows = []
+    for language, ipa in keys:
+        result = cache.get((language, ipa))
+        if isinstance(result, str):
+            rows.append((language, ipa, result))
+
+    with database:
+        database.executemany(
+            "INSERT OR IGNORE INTO tokens VALUES (?, ?, ?)",
+            rows,
+        )
+
+
+def tokenize_key(key: Key) -> Result:
+    """Tokenize IPA transcription and join the tokens with spaces.
+
+    Returns the `UnknownSymbol` error instead of raising it, so that it can be
+    sent back from worker processes.
+    Skips the memoization in `tokenize`, because results are already cached
+    by key.
+    """
+    language, ipa = key
+    try:
+        return " ".join(_tokenize(ipa, language, default_corrections))
+    except UnknownSymbol as exc:
+        return exc.with_traceback(None)
+
+
+def in_range(row: list[str], index: int) -> bool:
+    """Check if index is a valid index into row."""
+    return -len(row) <= index < len(row)
+
+
+def is_blank(ipa: str) -> bool:
+    """Check if IPA transcription is empty or only has spaces.
+
+    These don't need to be tokenized, because they never have any tokens.
+    """
+    return not ipa.strip(" ")
+
+
+def new_keys(
+    batch: list[list[str]],
+    index: int,
+    language_index: int | None,
+    cache: dict[Key, Result],
+) -> list[Key]:
+    """Return (language, IPA transcription) pairs in batch that aren't cached.
+
+    Rows with out of range indices are ignored.
+    """
+    keys = set()
+    for row in batch:
+        if not in_range(row, index) or is_blank(row[index]):
+            continue
+        if language_index is None:
+            keys.add(("*", row[index]))
+        elif in_range(row, language_index):
+            keys.add((row[language_index], row[index]))
+    keys.difference_update(cache)
+    return list(keys)
+
+
+def tokenize_batch(
+    batch: list[list[str]],
+    args: Namespace,
+    cache: dict[Key, Result],
+) -> t.Iterator[list[str]]:
+    """Tokenize IPA transcriptions in batch of rows in-place.
+
+    Rows with out of range indices or unknown symbols are skipped if
+    `args.silent`.
+    """
+    # Look these up once instead of once per row.
     index = args.index
     language_index = args.language_index
-    try:
-        for row in reader(sys.stdin):
-            try:
-                ipa = row[index]
-            except IndexError:
-                sys.exit(f"index {index} out of range: {row}")
-
-            try:
-                language = (
-                    "*" if language_index is None else row[language_index]
-                )
-            except IndexError:
-                sys.exit(f"index {index} out of range: {row}")
-
-            try:
-                row[index] = " ".join(tokenize(ipa, language=language))
-            except UnknownSymbol as exc:
-                if args.silent:
-                    continue
-
-                symbol = exc.unknown_symbol
-                transcription = exc.transcription
-                msg = f"unexpected [{symbol}] in {transcription}: {row}"
-                sys.exit(msg)
-            out.writerow(row)
-    except KeyboardInterrupt:
-        pass
+    silent = args.silent
+    cache_get = cache.get
+
+    for row in batch:
+        if not in_range(row, index):
+            if silent:
+                continue
+            sys.exit(f"index {index} out of range: {row}")
+
+        if language_index is None:
+            key = ("*", row[index])
+        elif in_range(row, language_index):
+            key = (row[language_index], row[index])
+        elif silent:
+            continue
+        else:
+            sys.exit(f"language index {language_index} out of range: {row}")
+
+        if is_blank(key[1]):
+            row[index] = ""
+            yield row
+            continue
+
+        result = cache_get(key)
+        if result is None:
+            result = cache[key] = tokenize_key(key)
+
+        if isinstance(result, UnknownSymbol):
+            if silent:
+                continue
+
+            symbol = result.unknown_symbol
+            transcription = result.transcription
+            sys.exit(f"unexpected [{symbol}] in {transcription}: {row}")
+
+        row[index] = result
+        yield row
+
+
+def tokenize_rows(
+    rows: t.Iterable[list[str]],
+    args: Namespace,
+) -> t.Iterator[list[str]]:
+    """Tokenize IPA transcriptions in rows.
+
+    Rows with out of range indices or unknown symbols are skipped if
+    `args.silent`.
+    Large inputs are tokenized in parallel using `args.workers` processes.
+    Uses the SQLite cache in `args.cache` if it's not `None`.
+    """
+    workers = args.workers
+
+    # Transcriptions are often repeated, so tokenize each one only once.
+    # The results can also be saved in a database for later runs.
+    cache: dict[Key, Result] = {}
+    with ExitStack() as stack:
+        database = None
+        if args.cache is not None:
+            database = stack.enter_context(closing(open_cache(args.cache)))
+            cache = load_cache(database)
+
+        pool: Pool | None = None
+        iterator = iter(rows)
+        for batch in iter(
+            lambda: list(islice(iterator, args.batch_size)),
+            [],
+        ):
+            keys = new_keys(batch, args.index, args.language_index, cache)
+            if workers > 1 and len(keys) >= PARALLEL_THRESHOLD:
+                if pool is None:
+                    pool = stack.enter_context(
+                        Pool(workers, ignore_interrupts),
+                    )
+                chunksize = max(1, len(keys) // (workers * 4))
+                results = pool.map(tokenize_key, keys, chunksize)
+                cache.update(zip(keys, results))
+
+            yield from tokenize_batch(batch, args, cache)
+            if database is not None:
+                save_cache(database, keys, cache)
+
+
+def write_rows(file: t.TextIO, rows: list[list[str]]) -> None:
+    """Write rows to CSV file.
+
+    If none of the fields need to be quoted, the rows are joined directly,
+    which is much faster than `csv.writer.writerows`.
+    """
+    if not rows:
+        return
+
+    lines = [",".join(row) for row in rows]
+    text = "\r\n".join(lines)
+
+    # Fields that contain commas, quotes or newlines need to be quoted, and so
+    # do rows with a single empty field.
+    commas = sum(map(len, rows)) - len(rows)
+    quote = "" in lines or text.count(",") != commas
+    if quote or '"' in text or "\r" in text or "\n" in text:
+        writer(file).writerows(rows)
+        return
+    file.write(text + "\r\n")
+
+
+def main(args: Namespace) -> None:
+    """Script entrypoint."""
+    # Use large buffers to reduce the number of read and write calls.
+    # Rows are also written in batches instead of one at a time.
+    with (
+        open(
+            sys.stdin.fileno(),
+            buffering=BUFFER_SIZE,
+            encoding="utf-8",
+            newline="",
+            closefd=False,
+        ) as stdin,
+        open(
+            sys.stdout.fileno(),
+            "w",
+            buffering=BUFFER_SIZE,
+            encoding="utf-8",
+            newline="",
+            closefd=False,
+        ) as stdout,
+    ):
+        batch: list[list[str]] = []
+        try:
+            for row in tokenize_rows(reader(stdin), args):
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    write_rows(stdout, batch)
+                    batch.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            write_rows(stdout, batch)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+# Copyright 2023 Levi Gruspe
+# Licensed under GNU GPLv3 or later
+# See https://www.gnu.org/licenses/gpl-3.0.en.html
+"""Helpers shared by command-line scripts."""
+
+from argparse import ArgumentTypeError
+from signal import signal, SIGINT, SIG_IGN
+
+
+# Rows are read in batches, and the new transcriptions in each batch are
+# tokenized in parallel.
+# Batches with only a few new transcriptions are tokenized serially, because
+# it's not worth the overhead.
+PARALLEL_BATCH_SIZE = 50_000
+PARALLEL_THRESHOLD = 1024
+
+
+def positive_int(value: str) -> int:
+    """Parse positive integer argument."""
+    result = int(value)
+    if result <= 0:
+        raise ArgumentTypeError(f"expected a positive integer: {value}")
+    return result
+
+
+def ignore_interrupts() -> None:
+    """Ignore keyboard interrupts in worker processes.
+
+    The main process handles them instead.
+    """
+    signal(SIGINT, SIG_IGN)
@@ -4,13 +4,19 @@
 # pylint: disable=too-many-lines
 """Correction tables."""
 
-from ipa_tokenizer.normalize import normalize_ipa
+from functools import cache
+from types import MappingProxyType
+import typing as t
 
 
-def create_preprocessing_table() -> dict[int, str]:
+@cache
+def create_preprocessing_table() -> t.Mapping[int, str]:
     """Return rules for translating unknown symbols during preprocessing.
 
     The result is a translation table compatible with `str.translate`.
+    Keys and values should already be normalized using `normalize_ipa`.
+    The table is built on the first call and shared by later calls as a
+    read-only mapping.
     """
     table = {
         ## Suprasegmentals not used by PHOIBLE
@@ -181,14 +187,17 @@ def create_preprocessing_table() -> dict[int, str]:
         # These letters appear in zh transcriptions that aren't actually
         # transcriptions, but were picked up by kaikki.
     }
-    return {
-        ord(normalize_ipa(key)): normalize_ipa(value)
-        for key, value in table.items()
-    }
+    return MappingProxyType(str.maketrans(table))
+
 
+@cache
+def create_tokenization_table() -> t.Mapping[str, str]:
+    """Return rules for translating unknown symbols during tokenization.
 
-def create_tokenization_table() -> dict[str, str]:
-    """Return rules for translating unknown symbols during tokenization."""
+    Keys and values should already be normalized using `normalize_ipa`.
+    The table is built on the first call and shared by later calls as a
+    read-only mapping.
+    """
     # The tokenization table is used after preprocessing, so symbols that have
     # been deleted during preprocessing shouldn't appear in the keys of the
     # tokenization table (e.g. ᵑ -> ŋ).
@@ -414,7 +423,7 @@ def create_tokenization_table() -> dict[str, str]:
         "ɖʐ̥ʷ": "ʈʂʷ",
         "ɖʐ̥ʼ": "ʈʂʼ",
         "ɖʐ̥ː": "ʈʂː",
-        "ɖʐ̥͇": "ʈʂ͇",     # The key has an invisible equals sign below.
+        "ɖʐ͇̥": "ʈʂ͇",     # The key has an invisible equals sign below.
         "ɳɖʐ̥": "ɳʈʂ",
         "ɳɖʐ̥ʰ": "ɳʈʂʰ",
         "ʰɖʐ̥ʰ": "ʰʈʂʰ",
@@ -426,8 +435,8 @@ def create_tokenization_table() -> dict[str, str]:
         "ʑ̥ʰ": "ɕʰ",
         "ʑ̥ʼ": "ɕʼ",
         "ʑ̥ː": "ɕː",
-        "ʑ̥̟": "ɕ̟",       # The key has an invisible plus sign below.
-        "ʑ̥̟ː": "ɕ̟ː",     # The key has an invisible plus sign below.
+        "ʑ̟̥": "ɕ̟",       # The key has an invisible plus sign below.
+        "ʑ̟̥ː": "ɕ̟ː",     # The key has an invisible plus sign below.
         "ʑ̥ᶣ": "ɕᶣ",
         "ʷʰʑ̥ʰ": "ʷʰɕʰ",
 
@@ -805,17 +814,17 @@ def create_tokenization_table() -> dict[str, str]:
         "ⁿǀʱ": "ŋǀʱ",
 
         "ŋ̤ʇ": "ŋ̤ǀ",
-        "ⁿ̤ǀ": "ŋ̤ǀ",
+        "\u0324ⁿǀ": "ŋ̤ǀ",    # Normalized ⁿ̤ǀ
 
         "ŋ̥ʇ": "ŋ̥ǀ",
-        "ⁿ̥ǀ": "ŋ̥ǀ",
+        "\u0325ⁿǀ": "ŋ̥ǀ",    # Normalized ⁿ̥ǀ
 
         "ⁿǀ͓": "ŋǀ͓",
-        "ⁿ̥ǀ͓xˀ": "ŋ̥ǀ͓xˀ",
-        "ⁿ̥ǀ͓ʰ": "ŋ̥ǀ͓ʰ",
-        "ⁿ̥ǀ͓ˀ": "ŋ̥ǀ͓ˀ",
+        "\u0325ⁿǀ͓xˀ": "ŋ̥ǀ͓xˀ",    # Normalized ⁿ̥ǀ͓xˀ
+        "\u0325ⁿǀ͓ʰ": "ŋ̥ǀ͓ʰ",    # Normalized ⁿ̥ǀ͓ʰ
+        "\u0325ⁿǀ͓ˀ": "ŋ̥ǀ͓ˀ",    # Normalized ⁿ̥ǀ͓ˀ
 
-        "ⁿ̤ǀ͓": "ŋ̤ǀ͓",
+        "\u0324ⁿǀ͓": "ŋ̤ǀ͓",    # Normalized ⁿ̤ǀ͓
 
         # k͡ǃ Tenuis alveolar click
         # https://en.wikipedia.org/wiki/Tenuis_alveolar_click
@@ -1344,10 +1353,7 @@ def create_tokenization_table() -> dict[str, str]:
         ".": "",    # syllable break
         " ": "",
     }
-    return {
-        normalize_ipa(key): normalize_ipa(value)
-        for key, value in table.items()
-    }
+    return MappingProxyType(table)
 
 
 __all__ = ["create_preprocessing_table", "create_tokenization_table"]
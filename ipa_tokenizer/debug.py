@@ -4,12 +4,22 @@
 """Test tokenizer and print statistics."""
 
 from argparse import ArgumentParser, Namespace
-from collections import Counter
+from collections import Counter, defaultdict
+from contextlib import ExitStack
 from csv import reader
+from itertools import islice
 from logging import warning
+from multiprocessing.pool import Pool
+import os
 from pathlib import Path
 import typing as t
 
+from ipa_tokenizer._cli import (
+    ignore_interrupts,
+    PARALLEL_BATCH_SIZE,
+    PARALLEL_THRESHOLD,
+    positive_int,
+)
 from ipa_tokenizer.tokenizer import tokenize, UnknownSymbol
 
 
@@ -24,12 +34,14 @@ class UnknownSymbolCounter:
     """Records most common symbol errors."""
     def __init__(self) -> None:
         self.symbol_counter: Counter[Symbol] = Counter()
-        self.language_counters: dict[Symbol, Counter[Language]] = {}
+        self.language_counters: defaultdict[Symbol, Counter[Language]] = (
+            defaultdict(Counter)
+        )
 
     def record_error(self, language: Language, symbol: Symbol) -> None:
         """Record symbol error."""
         self.symbol_counter[symbol] += 1
-        self.language_counters.setdefault(symbol, Counter())[language] += 1
+        self.language_counters[symbol][language] += 1
 
     def summarize(
         self,
@@ -54,31 +66,83 @@ class UnknownSymbolCounter:
         return result
 
 
-def load_tsv(path: Path) -> list[Record]:
-    """Load transcriptions from a TSV file."""
-    with open(path, encoding="utf-8") as file:
-        rows = [
-            t.cast(Record, tuple(row)) for row in reader(file, delimiter="\t")
-        ]
-    return rows
+def iter_tsv(path: Path) -> t.Iterator[Record]:
+    """Read transcriptions from a TSV file one record at a time."""
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in reader(file, delimiter="\t"):
+            yield t.cast(Record, tuple(row))
 
 
-def debug(records: list[Record]) -> None:
+def load_tsv(path: Path) -> list[Record]:
+    """Load transcriptions from a TSV file."""
+    return list(iter_tsv(path))
+
+
+def check_record(record: Record) -> UnknownSymbol | None:
+    """Try to tokenize the transcription in record.
+
+    Returns the `UnknownSymbol` error instead of raising it, so that it can be
+    sent back from worker processes.
+    """
+    language, _, ipa = record
+    try:
+        tokenize(ipa, language)
+    except UnknownSymbol as exc:
+        return exc.with_traceback(None)
+    return None
+
+
+def check_records(
+    records: t.Iterable[Record],
+    workers: int = 1,
+) -> t.Iterator[tuple[Record, UnknownSymbol | None]]:
+    """Try to tokenize transcriptions in records using `workers` processes.
+
+    Yields records in order along with their errors.
+    """
+    if workers <= 1:
+        for record in records:
+            yield record, check_record(record)
+        return
+
+    # Records are sent to the workers in batches, so that the whole file
+    # doesn't have to be read into memory.
+    # Small batches are checked serially, and the pool is only started once
+    # there's a batch large enough to need it.
+    iterator = iter(records)
+    with ExitStack() as stack:
+        pool: Pool | None = None
+        for batch in iter(
+            lambda: list(islice(iterator, PARALLEL_BATCH_SIZE)),
+            [],
+        ):
+            if len(batch) < PARALLEL_THRESHOLD:
+                for record in batch:
+                    yield record, check_record(record)
+                continue
+
+            if pool is None:
+                pool = stack.enter_context(Pool(workers, ignore_interrupts))
+            chunksize = max(1, len(batch) // (workers * 4))
+            yield from zip(batch, pool.map(check_record, batch, chunksize))
+
+
+def debug(records: t.Iterable[Record], workers: int = 1) -> None:
     """Try to tokenize all transcriptions in records and print some stats."""
     counter = UnknownSymbolCounter()
     passed = 0
     failed = 0
-    for language, word, ipa in records:
-        try:
-            tokenize(ipa, language)
+    for (language, word, ipa), exc in check_records(records, workers):
+        if exc is None:
             passed += 1
-        except UnknownSymbol as exc:
-            transcription = exc.transcription
-            symbol = exc.unknown_symbol
+            continue
 
-            failed += 1
-            warning(f"{language}\t{word}\t{ipa}\t>\t{transcription}\t{symbol}")
-            counter.record_error(language, symbol)
+        transcription = exc.transcription
+        symbol = exc.unknown_symbol
+
+        failed += 1
+        warning(f"{language}\t{word}\t{ipa}\t>\t{transcription}\t{symbol}")
+        counter.record_error(language, symbol)
 
     if summary := counter.summarize():
         warning(summary)
@@ -95,13 +159,20 @@ def parse_args() -> Namespace:
         type=Path,
         help="path to TSV file (columns: language, word, transcription)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
     return parser.parse_args()
 
 
 def main(args: Namespace) -> None:
     """Script entrypoint."""
-    records = load_tsv(args.tsv)
-    debug(records)
+    debug(iter_tsv(args.tsv), args.workers)
 
 
 if __name__ == "__main__":
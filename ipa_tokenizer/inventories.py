@@ -5,6 +5,7 @@
 
 from collections import Counter
 from csv import reader
+from functools import cache
 from pathlib import Path
 
 from ipa_tokenizer.normalize import normalize_ipa
@@ -22,10 +23,14 @@ def get_phoible_inventories() -> dict[str, set[str]]:
     """
     combined = set()
     result: dict[str, set[str]] = {}
+
+    # Most sounds occur in many inventories, so only normalize each one once.
+    normalize = cache(normalize_ipa)
+
     path = Path(__file__).with_name("inventories.csv")
-    with open(path, encoding="utf-8") as file:
+    with open(path, encoding="utf-8", newline="") as file:
         for glottocode, sounds in reader(file):
-            inventory = {normalize_ipa(sound) for sound in sounds.split()}
+            inventory = {normalize(sound) for sound in sounds.split()}
 
             # Discard symbols that shouldn't be in sound inventories.
             inventory.discard("ː")
@@ -44,8 +49,7 @@ def sound_frequencies(inventories: dict[str, set[str]]) -> Counter[str]:
     for language, inventory in inventories.items():
         if language == "*":
             continue
-        for sound in inventory:
-            counter[sound] += 1
+        counter.update(inventory)
     return counter
 
 
@@ -4,6 +4,9 @@
 # pylint: disable=invalid-name
 """IPA transcription tokenizer."""
 
+from functools import lru_cache
+import typing as t
+
 from ipa_tokenizer.corrections import (
     create_preprocessing_table,
     create_tokenization_table,
@@ -18,98 +21,217 @@ from ipa_tokenizer.normalize import normalize_ipa
 
 
 inventories = get_phoible_inventories()
-phones = inventories["*"]
+phones = frozenset(inventories["*"])
 preprocessing_table = create_preprocessing_table()
 default_corrections = create_tokenization_table()
 frequencies = sound_frequencies(inventories)
 tones = get_tone_letters()
 modifiers = {"ˑ", "ː"}
 
-
-class UnknownSymbol(Exception):
-    """Raised when an unknown symbol is encountered during tokenization."""
-    def __init__(self, unknown_symbol: str, transcription: str) -> None:
-        super()
-        self.unknown_symbol = unknown_symbol
-        self.transcription = transcription
+Trie: t.TypeAlias = dict[str, "Trie"]
 
 
-def score_guess(guess: str, inventory: set[str]) -> tuple[int, int]:
-    """Assign a score to a guess.
+def create_trie(words: t.Iterable[str]) -> Trie:
+    """Create a prefix tree of words.
 
-    The score is meant to be used as a sort key for sorting guesses
-    (lower-scoring guesses are prioritized).
+    Each node is a dict keyed by the next character.
+    The empty string marks the end of a word.
     """
-    # Prefer guesses that are in the inventory.
-    first = int(guess not in inventory)
-
-    # If the language isn't specified, assign score based on frequency.
-    if inventory is phones:
-        second = -frequencies.get(guess, -1)
-        return (first, second)
-
-    # If the language is specified, prefer the longest guess.
-    return (first, -len(guess))
-
-
-def candidate_tokens(ipa: str, inventory: set[str]) -> list[str]:
-    """Return prefixes of IPA that are valid phones in some language.
-
-    The result is sorted by priority (prefer prefixes in inventory, then prefer
-    longer prefixes).
+    root: Trie = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return root
+
+
+def match_ends(ipa: str, start: int, trie: Trie) -> t.Iterator[int]:
+    """Yield end indices of words in the trie that begin at `start` in IPA."""
+    node = trie
+    for end in range(start + 1, len(ipa) + 1):
+        child = node.get(ipa[end - 1])
+        if child is None:
+            return
+        node = child
+        if "" in node:
+            yield end
+
+
+phone_trie = create_trie(phones)
+default_correction_trie = create_trie(default_corrections)
+
+# Tries of custom correction tables, keyed by table identity.
+# Each entry also keeps the table alive, so that its id can't be reused, and
+# the keys the trie was built from, in case the table gets modified.
+CORRECTION_TRIE_CACHE_SIZE = 16
+correction_tries: dict[
+    int,
+    tuple[t.Mapping[str, str], frozenset[str], Trie],
+] = {}
+
+
+def get_correction_trie(corrections: t.Mapping[str, str]) -> Trie:
+    """Return trie of correction table keys.
+
+    Tries are only rebuilt when the keys of the table change.
     """
-    prefixes = [ipa[:i + 1] for i in range(len(ipa))]
-    prefixes.sort(key=lambda guess: score_guess(guess, inventory))
-    return prefixes
+    if corrections is default_corrections:
+        return default_correction_trie
 
+    entry = correction_tries.get(id(corrections))
+    if entry is not None and entry[1] == corrections.keys():
+        return entry[2]
 
-def _help_tokenize(
-    ipa: str,
-    corrections: dict[str, str] = default_corrections,
-    inventory: set[str] = phones,
-) -> tuple[bool, list[str]]:
-    """Help tokenize IPA transcription.
-
-    Returns `ok` and `tokens`.
-    If `ok`, `tokens` is a list of tokens.
-    If not, `tokens` is a list containing the symbol that caused the
-    tokenization to fail.
-    """
-    # Base cases.
-    if not ipa:
-        return True, []
-    if len(ipa) == 1:
-        if ipa in corrections:
-            return True, [corrections[ipa]]
-        return (ipa in phones), [ipa]
-
-    # Result to return if tokenization fails.
-    result = [""]
-
-    guesses = candidate_tokens(ipa, inventory)
-    for guess in guesses:
-        if (guess not in corrections) and (guess not in phones):
-            result = [guess]
-            continue
+    keys = frozenset(corrections)
+    trie = create_trie(keys)
+    if len(correction_tries) >= CORRECTION_TRIE_CACHE_SIZE:
+        # Evict oldest entry.
+        del correction_tries[next(iter(correction_tries))]
+    correction_tries[id(corrections)] = (corrections, keys, trie)
+    return trie
 
-        n = len(guess)
-        ok, rest = _help_tokenize(ipa[n:], corrections, inventory)
-        if not ok:
-            result = rest
-            continue
 
-        return True, [corrections.get(guess, guess), *rest]
+class UnknownSymbol(Exception):
+    """Raised when an unknown symbol is encountered during tokenization."""
+    def __init__(self, unknown_symbol: str, transcription: str) -> None:
+        super().__init__(unknown_symbol, transcription)
+        self.unknown_symbol = unknown_symbol
+        self.transcription = transcription
 
-    # No matches found.
-    return False, result
 
+class Transcription:
+    """IPA transcription being tokenized.
 
-def get_language_inventory(language: str) -> set[str]:
+    Suffixes of the transcription are identified by their start index, so
+    that backtracking doesn't need to slice the transcription.
+    """
+    def __init__(
+        self,
+        ipa: str,
+        corrections: t.Mapping[str, str],
+        inventory: frozenset[str],
+        correction_trie: Trie,
+    ) -> None:
+        """`correction_trie` should contain the keys of `corrections`."""
+        self.ipa = ipa
+        self.corrections = corrections
+        self.inventory = inventory
+        self.correction_trie = correction_trie
+
+        # Results for suffixes of the transcription, so that backtracking
+        # doesn't tokenize the same suffix twice.
+        self.memo: dict[int, tuple[bool, tuple[str, ...]]] = {}
+
+    def tokenize(self, start: int = 0) -> tuple[bool, tuple[str, ...]]:
+        """Tokenize suffix of the transcription.
+
+        Returns `ok` and `tokens`.
+        If `ok`, `tokens` is a tuple of tokens.
+        If not, `tokens` is a tuple containing the symbol that caused the
+        tokenization to fail.
+        """
+        # Base cases.
+        size = len(self.ipa) - start
+        if size == 0:
+            return True, ()
+        if size == 1:
+            symbol = self.ipa[start]
+            if symbol in self.corrections:
+                return True, (self.corrections[symbol],)
+            return (symbol in phones), (symbol,)
+
+        # Results of failed guesses, keyed by end index.
+        failures: dict[int, tuple[str, ...]] = {}
+
+        memo = self.memo
+        for guess in self.candidate_tokens(start):
+            end = start + len(guess)
+
+            # Check the memo here instead of at the start of the method, so
+            # that each token only adds one frame to the recursion.
+            result = memo.get(end)
+            if result is None:
+                result = self.tokenize(end)
+
+            ok, rest = result
+            if not ok:
+                failures[end] = rest
+                continue
+
+            result = True, (self.corrections.get(guess, guess), *rest)
+            memo[start] = result
+            return result
+
+        # No matches found.
+        result = False, self.failed_symbol(start, failures)
+        memo[start] = result
+        return result
+
+    def candidate_tokens(self, start: int) -> list[str]:
+        """Return prefixes of suffix that are valid phones or correction keys.
+
+        The result is sorted by priority.
+        Prefixes in the inventory come first.
+        If the language isn't specified, more common sounds are preferred.
+        Otherwise, longer prefixes are preferred.
+        """
+        ipa = self.ipa
+        inventory = self.inventory
+
+        ends = set(match_ends(ipa, start, phone_trie))
+        ends.update(match_ends(ipa, start, self.correction_trie))
+
+        found = []
+        not_found = []
+        for end in sorted(ends):
+            prefix = ipa[start:end]
+            if prefix in inventory:
+                found.append(prefix)
+            else:
+                not_found.append(prefix)
+
+        if inventory is phones:
+            # Sort is stable, so shorter prefixes win ties.
+            found.sort(key=frequencies.__getitem__, reverse=True)
+        else:
+            found.reverse()
+            not_found.reverse()
+        return found + not_found
+
+    def failed_symbol(
+        self,
+        start: int,
+        failures: dict[int, tuple[str, ...]],
+    ) -> tuple[str, ...]:
+        """Return the symbol to report when tokenization fails.
+
+        This is the failure from the lowest-priority prefix, whether or not
+        it's a valid token, so that errors don't depend on which prefixes were
+        tried.
+        `failures` maps end indices of prefixes that were tried to their
+        failures.
+        """
+        # If the language isn't specified, that's the whole suffix.
+        if self.inventory is phones:
+            return (self.ipa[start:],)
+
+        # Otherwise, it's the shortest prefix that isn't in the inventory.
+        for end in range(start + 1, len(self.ipa) + 1):
+            guess = self.ipa[start:end]
+            if guess not in self.inventory:
+                return failures.get(end, (guess,))
+        return ("",)
+
+
+@lru_cache(maxsize=1024)
+def get_language_inventory(language: str) -> frozenset[str]:
     """Return sound inventory for the language.
 
     `language` should be a Wiktionary language code.
     Special case: if `language = "*"`, returns a reference to the entire
     PHOIBLE sound inventory.
+    Results are cached and shared between calls.
     """
     if language == "*":
         return phones
@@ -117,73 +239,76 @@ def get_language_inventory(language: str) -> set[str]:
     result = set()
     for code in to_glottocode(language):
         result.update(inventories.get(code, set()))
-    return result
+    return frozenset(result)
 
 
 def fix_vowel_length_modifiers(tokens: list[str]) -> None:
     """Drop vowel length modifiers that don't combine with preceding tokens.
 
     And reorder tokens so that vowel length modifiers precede token letters.
+    Modifiers that are dropped or combined are replaced with empty strings.
     """
-    if not tokens:
-        return
+    result: list[str] = []
 
-    if tokens[0] in modifiers:
-        tokens[0] = ""
+    # Tone letters that haven't been added to the result yet, so that length
+    # modifiers that come after them can be moved in front of them.
+    pending: list[str] = []
 
-    # Move length modifiers before token letters.
-    for i in range(1, len(tokens)):
-        modifier = tokens[i]
-        if modifier not in modifiers:
+    for i, token in enumerate(tokens):
+        if token in tones:
+            pending.append(token)
             continue
 
-        j = i - 1
-        while j >= 0 and tokens[j] in tones:
-            tokens[j + 1] = tokens[j]
-            j -= 1
-        tokens[j + 1] = modifier
-
-    for i in range(1, len(tokens)):
-        modifier = tokens[i]
-        if modifier not in modifiers:
+        if token not in modifiers:
+            result.extend(pending)
+            pending.clear()
+            result.append(token)
             continue
 
-        # Check if modifier combines with the preceding symbol.
-        # If not, delete it.
-        segment = tokens[i - 1] + modifier
-        if segment in phones:
-            tokens[i - 1] = segment
-        tokens[i] = ""
+        if i == 0:
+            result.append("")
+        elif not result:
+            # Only tone letters precede the modifier.
+            result.append(token)
+        else:
+            # Check if modifier combines with the preceding symbol.
+            # If not, delete it.
+            segment = result[-1] + token
+            if segment in phones:
+                result[-1] = segment
+            result.append("")
 
+    result.extend(pending)
+    tokens[:] = result
 
-def tokenize(
+
+def _tokenize(
     ipa: str,
-    language: str = "*",
-    corrections: dict[str, str] = default_corrections,
+    language: str,
+    corrections: t.Mapping[str, str],
 ) -> list[str]:
-    """Tokenize IPA transcription into a list of tokens.
-
-    Takes an optional Wiktionary `language` code.
-    The tokenization algorithm will prioritize sounds that appear in the
-    language.
-    Raises an `UnknownSymbol` exception when an unknown symbol is encountered
-    during tokenization.
-    """
-    ipa = normalize_ipa(ipa).translate(preprocessing_table)
-
-    # Further processing.
+    """Tokenize IPA transcription without memoization."""
     # ^X appears in zh Wiktionary transcriptions, but it's probably a bug.
     # ˣ is just a guess.
     # This substitution can also be done using correction tables, but this is
     # much faster.
-    ipa.replace("^X", "ˣ")
+    # It has to happen before preprocessing, which deletes ˣ.
+    ipa = normalize_ipa(ipa).replace("^X", "ˣ")
+    ipa = ipa.translate(preprocessing_table)
 
     inventory = get_language_inventory(language)
 
     ipa = normalize_ipa(ipa)
-    ok, tokens = _help_tokenize(ipa, corrections, inventory)
+    transcription = Transcription(
+        ipa,
+        corrections,
+        inventory,
+        get_correction_trie(corrections),
+    )
+    ok, result = transcription.tokenize()
     if not ok:
-        raise UnknownSymbol("".join(tokens), ipa)
+        raise UnknownSymbol("".join(result), ipa)
+    tokens = list(result)
 
     # Post-processing.
     fix_vowel_length_modifiers(tokens)
@@ -193,4 +318,36 @@ def tokenize(
     return [token for token in tokens if token]
 
 
+@lru_cache(maxsize=100_000)
+def _tokenize_with_default_corrections(
+    ipa: str,
+    language: str,
+) -> tuple[str, ...]:
+    """Memoized `_tokenize` with the default corrections table.
+
+    Returns a tuple so that cached results can't be modified by callers.
+    """
+    return tuple(_tokenize(ipa, language, default_corrections))
+
+
+def tokenize(
+    ipa: str,
+    language: str = "*",
+    corrections: t.Mapping[str, str] = default_corrections,
+) -> list[str]:
+    """Tokenize IPA transcription into a list of tokens.
+
+    Takes an optional Wiktionary `language` code.
+    The tokenization algorithm will prioritize sounds that appear in the
+    language.
+    Raises an `UnknownSymbol` exception when an unknown symbol is encountered
+    during tokenization.
+
+    Results are memoized when the default corrections table is used.
+    """
+    if corrections is default_corrections:
+        return list(_tokenize_with_default_corrections(ipa, language))
+    return _tokenize(ipa, language, corrections)
+
+
 __all__ = ["tokenize", "UnknownSymbol"]
@@ -13,6 +13,7 @@ from ipa_tokenizer.corrections import (
     create_tokenization_table,
 )
 from ipa_tokenizer.inventories import get_phoible_inventories
+from ipa_tokenizer.normalize import normalize_ipa
 
 
 @pytest.fixture
@@ -23,13 +24,13 @@ def phoible() -> set[str]:
 
 
 @pytest.fixture
-def preprocessing_table() -> dict[int, str]:
+def preprocessing_table() -> t.Mapping[int, str]:
     """Return preprocessing table."""
     return create_preprocessing_table()
 
 
 @pytest.fixture
-def tokenization_table() -> dict[str, str]:
+def tokenization_table() -> t.Mapping[str, str]:
     """Return tokenization table."""
     return create_tokenization_table()
 
@@ -49,7 +50,7 @@ def glyphs(phoible: set[str]) -> set[str]:
 
 
 def test_preprocessing_table_keys(
-    preprocessing_table: dict[int, str],
+    preprocessing_table: t.Mapping[int, str],
     glyphs: set[str],
 ) -> None:
     """Keys should not be in any PHOIBLE inventory."""
@@ -59,7 +60,7 @@ def test_preprocessing_table_keys(
 
 
 def test_preprocessing_table_values(
-    preprocessing_table: dict[int, str],
+    preprocessing_table: t.Mapping[int, str],
     glyphs: set[str],
     phoible: set[str],
 ) -> None:
@@ -72,7 +73,7 @@ def test_preprocessing_table_values(
 
 
 def test_tokenization_table_keys(
-    tokenization_table: dict[str, str],
+    tokenization_table: t.Mapping[str, str],
     phoible: set[str],
 ) -> None:
     """Keys should not be in PHOIBLE."""
@@ -83,7 +84,7 @@ def test_tokenization_table_keys(
 
 
 def test_tokenization_table_values(
-    tokenization_table: dict[str, str],
+    tokenization_table: t.Mapping[str, str],
     phoible: set[str],
 ) -> None:
     """Values should be in PHOIBLE.
@@ -96,8 +97,34 @@ def test_tokenization_table_values(
         assert value in phoible
 
 
+def test_preprocessing_table_normalized(
+    preprocessing_table: t.Mapping[int, str],
+) -> None:
+    """Keys and values should already be normalized."""
+    for key, value in preprocessing_table.items():
+        assert normalize_ipa(chr(key)) == chr(key)
+        assert normalize_ipa(value) == value
+
+
+def test_tokenization_table_normalized(
+    tokenization_table: t.Mapping[str, str],
+) -> None:
+    """Keys and values should already be normalized."""
+    for key, value in tokenization_table.items():
+        assert normalize_ipa(key) == key
+        assert normalize_ipa(value) == value
+
+
+def test_tables_read_only() -> None:
+    """Shared tables shouldn't be modifiable."""
+    with pytest.raises(TypeError):
+        create_preprocessing_table()[ord("a")] = "b"    # type: ignore
+    with pytest.raises(TypeError):
+        create_tokenization_table()["a"] = "b"  # type: ignore
+
+
 def test_preprocessing_table_redundant_keys(
-    preprocessing_table: dict[int, str],
+    preprocessing_table: t.Mapping[int, str],
 ) -> None:
     """Key shouldn't be the same as the replacement value."""
     for key, value in preprocessing_table.items():
@@ -105,7 +132,7 @@ def test_preprocessing_table_redundant_keys(
 
 
 def test_tokenization_table_redundant_keys(
-    tokenization_table: dict[str, str],
+    tokenization_table: t.Mapping[str, str],
 ) -> None:
     """Key shouldn't be the same as the replacement value.
 
@@ -118,8 +145,8 @@ def test_tokenization_table_redundant_keys(
 
 
 def test_redundant_keys(
-    preprocessing_table: dict[int, str],
-    tokenization_table: dict[str, str],
+    preprocessing_table: t.Mapping[int, str],
+    tokenization_table: t.Mapping[str, str],
 ) -> None:
     """If a glyph gets substituted during preprocessing, it shouldn't appear in
     the tokenization table keys.
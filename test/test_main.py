@@ -0,0 +1,185 @@
+# Copyright 2023 Levi Gruspe
+# Licensed under GNU GPLv3 or later
+# See https://www.gnu.org/licenses/gpl-3.0.en.html
+"""Test command-line script."""
+
+from argparse import Namespace
+from contextlib import closing
+from csv import writer
+from io import StringIO
+from pathlib import Path
+import pickle
+import random
+import typing as t
+
+import pytest
+
+from ipa_tokenizer import __main__ as cli
+from ipa_tokenizer.__main__ import (
+    load_cache,
+    open_cache,
+    tokenize_rows,
+    write_rows,
+)
+from ipa_tokenizer._cli import PARALLEL_BATCH_SIZE
+from ipa_tokenizer.tokenizer import UnknownSymbol
+
+
+def make_args(**kwargs: t.Any) -> Namespace:
+    """Return script arguments, with defaults for the ones not given."""
+    args = {
+        "silent": False,
+        "index": 0,
+        "language_index": None,
+        "batch_size": PARALLEL_BATCH_SIZE,
+        "workers": 1,
+        "cache": None,
+    }
+    args.update(kwargs)
+    return Namespace(**args)
+
+
+def run(rows: list[list[str]], **kwargs: t.Any) -> list[list[str]]:
+    """Tokenize copies of rows with the given script arguments."""
+    copies = [list(row) for row in rows]
+    return list(tokenize_rows(copies, make_args(**kwargs)))
+
+
+def spy_tokenize_key(monkeypatch: pytest.MonkeyPatch) -> list[cli.Key]:
+    """Record keys passed to `tokenize_key` in the returned list."""
+    tokenized: list[cli.Key] = []
+    tokenize_key = cli.tokenize_key
+
+    def spy(key: cli.Key) -> cli.Result:
+        tokenized.append(key)
+        return tokenize_key(key)
+
+    monkeypatch.setattr(cli, "tokenize_key", spy)
+    return tokenized
+
+
+def test_unknown_symbol_is_picklable() -> None:
+    """Errors should survive being sent back from worker processes."""
+    exc = pickle.loads(pickle.dumps(UnknownSymbol("%", "a%")))
+    assert exc.unknown_symbol == "%"
+    assert exc.transcription == "a%"
+
+
+def test_tokenize_rows_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parallel tokenization should give the same rows as serial."""
+    monkeypatch.setattr(cli, "PARALLEL_THRESHOLD", 1)
+    rows = [
+        ["kat͡sa", "en"],
+        ["a%", "en"],
+        ["tʃa", "fr"],
+        ["kat͡sa", "en"],
+        ["dɔɡ", "en"],
+    ]
+    for batch_size in (2, 10):
+        serial = run(rows, language_index=1, silent=True, workers=1,
+                     batch_size=batch_size)
+        parallel = run(rows, language_index=1, silent=True, workers=2,
+                       batch_size=batch_size)
+        assert parallel == serial
+        assert len(serial) == 4
+
+
+def test_tokenize_rows_index_out_of_range() -> None:
+    """Rows with missing columns should be fatal unless silent."""
+    rows = [["a"], ["ka", "en"]]
+    with pytest.raises(SystemExit, match="^index 3 out of range"):
+        run(rows, index=3)
+    with pytest.raises(SystemExit, match="language index 1 out of range"):
+        run(rows, language_index=1)
+
+    assert not run(rows, index=3, silent=True)
+    assert run(rows, language_index=1, silent=True) == [["k a", "en"]]
+
+
+def test_tokenize_rows_with_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Results should be saved and loaded in later runs, except errors."""
+    path = tmp_path / "cache.db"
+    rows = [["ka", "en"], ["a%", "en"], ["pa", "fr"], ["ka", "en"]]
+    first = run(rows, language_index=1, silent=True, cache=path)
+    assert first == [["k a", "en"], ["p a", "fr"], ["k a", "en"]]
+
+    with closing(open_cache(path)) as database:
+        assert load_cache(database) == {
+            ("en", "ka"): "k a",
+            ("fr", "pa"): "p a",
+        }
+
+    # Only the error should be tokenized again.
+    tokenized = spy_tokenize_key(monkeypatch)
+    second = run(rows, language_index=1, silent=True, cache=path)
+    assert second == first
+    assert tokenized == [("en", "a%")]
+
+
+def test_tokenize_rows_blank(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Blank transcriptions should become empty without being tokenized."""
+    tokenized = spy_tokenize_key(monkeypatch)
+    rows = [[""], ["   "], ["ka"]]
+    assert run(rows) == [[""], [""], ["k a"]]
+    assert tokenized == [("*", "ka")]
+
+    # Only spaces count as blank.
+    with pytest.raises(SystemExit, match="unexpected"):
+        run([["\t"]])
+    assert not run([["\t"]], silent=True)
+
+
+def csv_writer_output(rows: list[list[str]]) -> str:
+    """Return rows written by `csv.writer`."""
+    file = StringIO(newline="")
+    writer(file).writerows(rows)
+    return file.getvalue()
+
+
+def write_rows_output(rows: list[list[str]]) -> str:
+    """Return rows written by `write_rows`."""
+    file = StringIO(newline="")
+    write_rows(file, rows)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [],
+        [["a", "b"], ["c", "d"]],
+        [["a,b", "c"]],
+        [['a"b', "c"]],
+        [["a\rb"], ["c"]],
+        [["a\nb"], ["c"]],
+        [["a\r\nb", "c"]],
+        [[]],
+        [["a"], []],
+        [[""]],
+        [["a"], [""], ["b"]],
+        [["", ""]],
+        [["", "a"], ["b", ""]],
+        [[" a ", "b "]],
+    ],
+)
+def test_write_rows(rows: list[list[str]]) -> None:
+    """`write_rows` should write the same thing as `csv.writer`."""
+    assert write_rows_output(rows) == csv_writer_output(rows)
+
+
+def test_write_rows_random() -> None:
+    """`write_rows` should write the same thing as `csv.writer`."""
+    rng = random.Random(0)
+    symbols = ["a", "b", " ", ",", '"', "\r", "\n"]
+    for _ in range(1000):
+        rows = [
+            [
+                "".join(rng.choices(symbols, k=rng.randrange(3)))
+                for _ in range(rng.randrange(4))
+            ]
+            for _ in range(rng.randrange(4))
+        ]
+        assert write_rows_output(rows) == csv_writer_output(rows)
@@ -0,0 +1,55 @@
+# Copyright 2023 Levi Gruspe
+# Licensed under GNU GPLv3 or later
+# See https://www.gnu.org/licenses/gpl-3.0.en.html
+"""Test search tool."""
+
+from csv import reader
+from io import StringIO
+
+import pytest
+
+from tools.search import candidate_rows, parse_substring
+
+WORDLIST = (
+    "en,cat,kæt\n"
+    "en,\"a, b\",ab\n"
+    "en,\"say \"\"hi\"\"\",hai\n"
+    "en,\"two\nlines\",kæt\n"
+    "\"en\",\"x\",\"t͡s\"\n"
+    "en,a,\"kæ\nt\"\n"
+    "en,tsa,t͡sa\n"
+    "\"en\",\"x,\ny\"\"\",\"a,\"\"b\"\n"
+    "en,dog,dɔɡ\n"
+)
+
+
+@pytest.mark.parametrize(
+    "substring,expected",
+    [
+        ("\\u0361", "͡"),
+        ("abc\\u035c", "abc͜"),
+        ("x\\u02b0y", "xʰy"),
+        ("\\u02B0", "ʰ"),
+        ("t͡s", "t͡s"),
+        ("é\\u0301", "é́"),
+        ("a\\", "a\\"),
+        ("\\u03", "\\u03"),
+        ("\\u03x1", "\\u03x1"),
+        ("a\\nb", "a\\nb"),
+        ("\\\\", "\\\\"),
+        ("\\x41", "\\x41"),
+    ],
+)
+def test_parse_substring(substring: str, expected: str) -> None:
+    """Only unicode escapes should be decoded."""
+    assert parse_substring(substring) == expected
+
+
+@pytest.mark.parametrize("substring", ["", "k", "æt", "t͡s", "a", ",", "x"])
+def test_candidate_rows(substring: str) -> None:
+    """Matching rows should be the same as with `csv.reader`."""
+    expected = [
+        row for row in reader(StringIO(WORDLIST)) if substring in row[2]
+    ]
+    rows = candidate_rows(StringIO(WORDLIST), substring)
+    assert [row for row in rows if substring in row[2]] == expected
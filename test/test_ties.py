@@ -0,0 +1,39 @@
+# Copyright 2023 Levi Gruspe
+# Licensed under GNU GPLv3 or later
+# See https://www.gnu.org/licenses/gpl-3.0.en.html
+"""Test tie counting tool."""
+
+import re
+
+import pytest
+
+from tools.ties import tie_contexts
+
+
+@pytest.mark.parametrize("context_size", [0, 1, 2, 3])
+@pytest.mark.parametrize(
+    "transcription",
+    [
+        "",
+        "t͡s",
+        "t͜s",
+        "͡ab",
+        "ab͡",
+        "͡",
+        "t͡sd͡z",
+        "t͡s͡ʃ",
+        "a͡͡b",
+        "͜͜͡͡",
+        "a\n͡b",
+        "a͡\nb",
+        "\n͡\n",
+        "ab͡c\nd͡ef",
+        "kat͡saˈt͜ʃa",
+    ],
+)
+def test_tie_contexts(transcription: str, context_size: int) -> None:
+    """Results should be the same as the regex that tie_contexts replaces."""
+    context = "." * context_size
+    pattern = re.compile(rf"{context}(?:\u0361|\u035c){context}")
+    expected = pattern.findall(transcription)
+    assert tie_contexts(transcription, context_size) == expected
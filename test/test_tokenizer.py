@@ -5,7 +5,12 @@
 
 import pytest
 
-from ipa_tokenizer.tokenizer import tokenize, UnknownSymbol
+from ipa_tokenizer.tokenizer import (
+    default_corrections,
+    get_correction_trie,
+    tokenize,
+    UnknownSymbol,
+)
 
 
 def test_tokenize_with_unknown_symbol() -> None:
@@ -61,3 +66,47 @@ def test_tokenize_with_tone_letters_and_length_modifier() -> None:
     ]
     for example in examples:
         assert example[0] == "aː"
+
+
+def test_tokenize_returns_new_list() -> None:
+    """Modifying the result shouldn't affect later calls."""
+    tokens = tokenize("aː")
+    tokens.append("b")
+    assert tokenize("aː") == ["aː"]
+
+
+def test_tokenize_with_custom_corrections() -> None:
+    """Custom correction keys should be recognized as tokens."""
+    with pytest.raises(UnknownSymbol):
+        tokenize("a%")
+    assert tokenize("a%", corrections={"%": ""}) == ["a"]
+    assert tokenize("a%%b", corrections={"%%": "h"}) == ["a", "h", "b"]
+
+
+def test_custom_correction_trie_is_reused() -> None:
+    """Tries of custom tables should only be rebuilt when keys change."""
+    corrections = dict(default_corrections)
+    trie = get_correction_trie(corrections)
+    assert tokenize("tʃa", corrections=corrections) == tokenize("tʃa")
+    assert get_correction_trie(corrections) is trie
+
+    corrections["%"] = ""
+    assert get_correction_trie(corrections) is not trie
+    assert tokenize("a%", corrections=corrections) == ["a"]
+
+
+def test_tokenize_backtracking_is_memoized() -> None:
+    """Failing transcriptions shouldn't take exponential time."""
+    with pytest.raises(UnknownSymbol):
+        tokenize("tsʰ" * 100 + "%")
+
+
+def test_tokenize_caret_x() -> None:
+    """^X should be treated like ˣ, which has no phonetic value."""
+    assert tokenize("ka^X") == ["k", "a"]
+    assert tokenize("ka^X") == tokenize("kaˣ")
+
+
+def test_tokenize_long_transcription() -> None:
+    """Long transcriptions shouldn't exceed the recursion limit."""
+    assert tokenize("pa" * 300) == ["p", "a"] * 300
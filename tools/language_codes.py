@@ -4,6 +4,7 @@
 """Map wiktionary language codes to Glottocodes."""
 
 from argparse import ArgumentParser, Namespace
+from collections import defaultdict
 from csv import reader
 from json import dumps
 from pathlib import Path
@@ -19,12 +20,12 @@ def parse_args() -> Namespace:
 
 def read_wiktionary() -> dict[str, set[str]]:
     """Create mapping from Wiktionary to standardized language codes."""
-    result: dict[str, set[str]] = {}
+    result: defaultdict[str, set[str]] = defaultdict(set)
     path = Path(__file__).with_name("data") / "wiktionary.txt"
     with open(path, encoding="utf-8") as file:
         for line in file:
             code = line.strip()
-            result.setdefault(code, set()).add(standardize_tag(code))
+            result[code].add(standardize_tag(code))
     return result
 
 
@@ -145,41 +146,42 @@ def read_phoible() -> dict[str, set[str]]:
     """Create mapping from standardized language codes to Glottocodes."""
     missing = missing_codes()
     later = wiktionary_codes()
+    skipped = missing.keys() | later.keys()
 
-    result: dict[str, set[str]] = {}
+    result: defaultdict[str, set[str]] = defaultdict(set)
     path = Path(__file__).with_name("data") / "phoible.csv"
     with open(path, encoding="utf-8") as file:
         for glottocode, iso639_3 in reader(file):
-            if glottocode in missing or glottocode in later:
+            if glottocode in skipped:
                 continue
 
-            if glottocode == "NA":
+            if glottocode == "NA" or iso639_3 == "NA":
                 # Nothing to be done.
+                # Languages without ISO 639-3 codes would be mapped to "und",
+                # which isn't included in the language mapping anyway.
                 continue
-            if iso639_3 == "NA":
-                iso639_3 = "und"
             tag = standardize_tag(iso639_3)
-            result.setdefault(tag, set()).add(glottocode)
+            result[tag].add(glottocode)
 
     # Insert missing codes.
     for glottocode, codes in missing.items():
         for iso639_3 in codes:
             tag = standardize_tag(iso639_3)
-            result.setdefault(tag, set()).add(glottocode)
+            result[tag].add(glottocode)
     return result
 
 
 def join(
     left: dict[str, set[str]],
     right: dict[str, set[str]],
-) -> dict[str, set[str]]:
+) -> defaultdict[str, set[str]]:
     """Return the composition right[left]."""
-    result: dict[str, set[str]] = {}
+    result: defaultdict[str, set[str]] = defaultdict(set)
     for key, values in left.items():
         for value in values:
             if value not in right:
                 continue
-            result.setdefault(key, set()).update(right[value])
+            result[key].update(right[value])
     return result
 
 
@@ -190,9 +192,9 @@ def create_language_mapping() -> dict[str, set[str]]:
 
     composition = join(first, second)
     for key, value in wiktionary_codes().items():
-        composition.setdefault(value, set()).add(key)
+        composition[value].add(key)
 
-    del composition["und"]
+    composition.pop("und", None)
     return composition
 
 
@@ -5,9 +5,15 @@
 
 from argparse import ArgumentParser, Namespace
 from csv import reader, writer
+from itertools import chain, islice
 from pathlib import Path
 import re
 import sys
+import typing as t
+
+
+BATCH_SIZE = 1024
+UNICODE_ESCAPE = re.compile(r"\\u([0-9a-fA-F]{4})")
 
 
 def parse_args() -> Namespace:
@@ -50,32 +56,54 @@ def parse_args() -> Namespace:
 def parse_substring(substring: str) -> str:
     """Parse IPA substring.
 
-    Decodes unicode escapes.
+    Decodes unicode escapes ('\\uXXXX').
+    Everything else, including other backslash escapes and incomplete unicode
+    escapes, is kept as is.
     """
-    pattern = r"\\u([0-9a-fA-F]{4})"
-    return re.sub(
-        pattern,
-        lambda m: chr(int(f"0x{m.group(1)}", base=16)),
-        substring,
-    )
+    return UNICODE_ESCAPE.sub(lambda match: chr(int(match[1], 16)), substring)
+
+
+def candidate_rows(
+    lines: t.Iterable[str],
+    substring: str,
+) -> t.Iterator[list[str]]:
+    """Parse CSV rows that might contain substring.
+
+    `lines` should come from a file opened in text mode without `newline=""`,
+    so that line endings are always "\n".
+    Lines without quotes can't have quoted fields, so they're split directly,
+    and only if they contain the substring.
+    A line with quotes might start a row that spans multiple lines, so it's
+    always parsed along with the rest of its row.
+    """
+    iterator = iter(lines)
+    for line in iterator:
+        if '"' in line:
+            yield from islice(reader(chain((line,), iterator)), 1)
+        elif substring in line:
+            yield line.rstrip("\n").split(",")
 
 
 def main(args: Namespace) -> None:
     """Script entrypoint."""
     substring = parse_substring(args.substring)
 
+    # Indices of columns to print.
+    shown = (args.language, args.word, args.transcription)
+    columns = [index for index, show in enumerate(shown) if show]
+
+    # Matches are written in batches instead of one at a time.
     out = writer(sys.stdout)
+    batch = []
     with open(args.wordlist, encoding="utf-8") as file:
-        for language, word, transcription in reader(file):
+        for row in candidate_rows(file, substring):
+            _, _, transcription = row
             if substring in transcription:
-                record = []
-                if args.language:
-                    record.append(language)
-                if args.word:
-                    record.append(word)
-                if args.transcription:
-                    record.append(transcription)
-                out.writerow(record)
+                batch.append([row[index] for index in columns])
+                if len(batch) >= BATCH_SIZE:
+                    out.writerows(batch)
+                    batch.clear()
+    out.writerows(batch)
 
 
 if __name__ == "__main__":
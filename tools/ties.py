@@ -7,7 +7,9 @@ from argparse import ArgumentParser, Namespace
 from collections import Counter
 from csv import reader
 from pathlib import Path
-import re
+
+
+TIES = ("\u0361", "\u035c")
 
 
 def parse_args() -> Namespace:
@@ -28,16 +30,41 @@ def parse_args() -> Namespace:
     return parser.parse_args()
 
 
+def find_tie(transcription: str, start: int) -> int:
+    """Return index of first tie at or after start, or -1 if there's none."""
+    first = transcription.find(TIES[0], start)
+    second = transcription.find(TIES[1], start)
+    if first < 0 or 0 <= second < first:
+        return second
+    return first
+
+
+def tie_contexts(transcription: str, context_size: int) -> list[str]:
+    """Find non-overlapping ties with context_size symbols on each side.
+
+    Matches are the same as those of `re.findall` with the pattern
+    `.{context_size}(?:\\u0361|\\u035c).{context_size}`.
+    """
+    results = []
+    index = find_tie(transcription, context_size)
+    while 0 <= index < len(transcription) - context_size:
+        window = transcription[index - context_size:index + context_size + 1]
+        if "\n" in window:
+            index = find_tie(transcription, index + 1)
+            continue
+        results.append(window)
+        index = find_tie(transcription, index + 2 * context_size + 1)
+    return results
+
+
 def main(args: Namespace) -> None:
     """Script entrypoint."""
-    context = "." * args.context_size
-    pattern = re.compile(rf"{context}(?:\u0361|\u035c){context}")
-
     counter: Counter[str] = Counter()
     with open(args.wordlist, encoding="utf-8") as file:
         for _, _, transcription in reader(file):
-            for result in pattern.findall(transcription):
-                counter[result] += 1
+            if TIES[0] not in transcription and TIES[1] not in transcription:
+                continue
+            counter.update(tie_contexts(transcription, args.context_size))
 
     for context, count in counter.most_common():
         print(context, count, sep="\t")